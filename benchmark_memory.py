@@ -0,0 +1,79 @@
+"""
+Memory benchmark: per-item footprint of the old dict items vs models.Item.
+
+Builds N synthetic products both ways and measures the allocations with
+tracemalloc. Field strings are created up front and shared by both runs,
+so the numbers show the container overhead that the item model changes.
+
+Usage:
+    python benchmark_memory.py            # 100k items
+    python benchmark_memory.py --items 500000
+"""
+import argparse
+import gc
+import tracemalloc
+
+from models import Item, SimilarItem
+
+# ------------------------- FIXTURE ---------------------------
+
+def make_fields(n):
+    """Synthetic field tuples shaped like real Daraz product cards."""
+    return [
+        (
+            f"Wireless Bluetooth Headphone Model {i} With Mic",
+            f"৳ {1000 + i % 5000:,}",
+            f"{260000000 + i}_BD-{1230000000 + i}",
+            f"https://www.daraz.com.bd/products/item-i{260000000 + i}.html",
+            f"{i % 1000} sold",
+            i % 1000,
+            f"https://img.drz.lazcdn.com/static/bd/p/{i:x}.jpg_200x200q80.jpg",
+        )
+        for i in range(n)
+    ]
+
+def build_dicts(fields):
+    return [
+        {"item": {
+            "name": name, "price": price, "sku": sku,
+            "link": link, "sold_text": sold_text, "sold_count": sold_count,
+            "image": image
+        }, "score": 90}
+        for name, price, sku, link, sold_text, sold_count, image in fields
+    ]
+
+def build_items(fields):
+    return [
+        SimilarItem(Item(name, price, sku, link, sold_text, sold_count, image), 90)
+        for name, price, sku, link, sold_text, sold_count, image in fields
+    ]
+
+# ------------------------- MEASUREMENT ---------------------------
+
+def measure(builder, fields):
+    """Return bytes allocated by builder(fields) and still alive afterwards."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = builder(fields)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return after - before
+
+def main():
+    parser = argparse.ArgumentParser(description="Item model memory benchmark")
+    parser.add_argument("--items", type=int, default=100_000, help="Number of items to build")
+    args = parser.parse_args()
+
+    fields = make_fields(args.items)
+    dict_bytes = measure(build_dicts, fields)
+    slot_bytes = measure(build_items, fields)
+
+    print(f"📏 Items: {args.items:,} (grouped as similar items, field strings shared)")
+    print(f"   dict items   : {dict_bytes / 2**20:8.2f} MiB | {dict_bytes / args.items:6.1f} B/item")
+    print(f"   models.Item  : {slot_bytes / 2**20:8.2f} MiB | {slot_bytes / args.items:6.1f} B/item")
+    print(f"   saved        : {(1 - slot_bytes / dict_bytes) * 100:5.1f}%")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Search latency benchmark against a realistically sized index.
+
+Builds a synthetic index shaped like a year of daily batch runs (105
+categories x 80 items per report), where most products come back day after
+day with new prices and sold counts and a few new listings appear every day,
+then times a set of typical queries.
+Exits non-zero if any query is slower than the budget.
+
+Usage:
+    python benchmark_search.py                  # 365 days into a temp file
+    python benchmark_search.py --days 730 --budget-ms 50
+    python benchmark_search.py --db bench.db    # build once, re-time on later runs
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+import search_index
+from models import Item, SimilarItem, Group
+
+# ------------------------- FIXTURE ---------------------------
+
+CATEGORIES = 105
+ITEMS_PER_REPORT = 80
+PRODUCTS_PER_CATEGORY = 400   # pool each day's 80 listings are drawn from
+NEW_PER_DAY = 8               # listings per category replaced with new ones daily
+
+WORDS = [
+    "wireless", "bluetooth", "gaming", "headphone", "earbuds", "charger", "cable",
+    "usb", "fast", "portable", "mini", "smart", "watch", "led", "lamp", "kitchen",
+    "storage", "box", "bottle", "steel", "cotton", "shirt", "men", "women", "kids",
+    "bag", "leather", "wallet", "mouse", "keyboard", "stand", "holder", "case",
+    "cover", "glass", "screen", "protector", "power", "bank", "speaker", "fan",
+]
+# Product titles draw from a long-tail vocabulary: the common words above
+# come first and show up often, brand/model-like words are rare
+VOCABULARY = WORDS + [f"brand{i}" for i in range(2000)]
+WEIGHTS = [1 / (rank + 20) for rank in range(len(VOCABULARY))]
+
+def make_product(rng, n):
+    """A (name, sku, link, image) tuple for product number n."""
+    name = " ".join(rng.choices(VOCABULARY, WEIGHTS, k=6)) + f" model {n}"
+    return (name, f"{260000000 + n}_BD-{1230000000 + n}",
+            f"https://www.daraz.com.bd/products/i{260000000 + n}.html",
+            f"https://img.drz.lazcdn.com/static/bd/p/{n:x}.jpg")
+
+def make_groups(rng, pool):
+    """One report's groups: 10 top sellers, the rest spread as similars."""
+    picked = rng.sample(pool, ITEMS_PER_REPORT)
+    groups = []
+    for i, (name, sku, link, image) in enumerate(picked):
+        item = Item(name, f"৳ {rng.randint(100, 5000):,}", sku, link,
+                    f"{rng.randint(0, 9999)} sold", 0, image)
+        if i < 10:
+            groups.append(Group(item))
+        else:
+            groups[i % 10].similars.append(SimilarItem(item, rng.randint(90, 100)))
+    return groups
+
+def build_index(conn, days, rng):
+    next_n = CATEGORIES * PRODUCTS_PER_CATEGORY
+    pools = [[make_product(rng, c * PRODUCTS_PER_CATEGORY + p) for p in range(PRODUCTS_PER_CATEGORY)]
+             for c in range(CATEGORIES)]
+    for day in range(days):
+        report_date = f"{2024 + day // 365}-{(day % 365) // 31 + 1:02d}-{day % 31 + 1:02d}"
+        for c, pool in enumerate(pools):
+            for slot in rng.sample(range(PRODUCTS_PER_CATEGORY), NEW_PER_DAY):
+                pool[slot] = make_product(rng, next_n)
+                next_n += 1
+            path = f"category_report/d{day}/category{c}.txt"
+            search_index.index_groups(conn, path, report_date, f"category {c}",
+                                      make_groups(rng, pool), 0)
+        if (day + 1) % 30 == 0:
+            print(f"   ...{day + 1} days indexed")
+
+# ------------------------- MEASUREMENT ---------------------------
+
+QUERIES = ["wireless", "gam", "wireless bluetooth headphone", "usb charger",
+           "260012345_BD-1230012345", "260012345_BD", "model 4242", "৳ 1,250", "zzzz"]
+
+def main():
+    parser = argparse.ArgumentParser(description="Search index latency benchmark")
+    parser.add_argument("--days", type=int, default=365, help="Days of daily reports to simulate")
+    parser.add_argument("--budget-ms", type=float, default=50.0, help="Slowest acceptable query")
+    parser.add_argument("--db", help="Index file to build (default: a temp file)")
+    args = parser.parse_args()
+
+    db_path = args.db or os.path.join(tempfile.mkdtemp(), "bench_index.db")
+    conn = search_index.connect(db_path)
+    conn.execute("PRAGMA synchronous = OFF")  # throwaway index, no need to fsync every report
+    rng = random.Random(42)
+
+    if conn.execute("SELECT COUNT(*) FROM products").fetchone()[0]:
+        print(f"♻️ Reusing existing index: {db_path}")
+    else:
+        print(f"🏗️ Building index: {args.days} days x {CATEGORIES} categories x {ITEMS_PER_REPORT} items")
+        started = time.perf_counter()
+        build_index(conn, args.days, rng)
+        print(f"   built in {time.perf_counter() - started:.1f}s")
+
+    products = conn.execute("SELECT COUNT(*) FROM products").fetchone()[0]
+    occurrences = conn.execute("SELECT COUNT(*) FROM occurrences").fetchone()[0]
+    print(f"📏 {products:,} distinct products, {occurrences:,} occurrences\n")
+
+    slowest = 0.0
+    for query in QUERIES:
+        search_index.search(conn, query)  # warm the page cache
+        started = time.perf_counter()
+        rows = search_index.search(conn, query)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        slowest = max(slowest, elapsed_ms)
+        print(f"   {query!r:32} {len(rows):3} hits  {elapsed_ms:7.2f} ms")
+    conn.close()
+
+    print(f"\nSlowest query: {slowest:.2f} ms (budget {args.budget_ms:.0f} ms)")
+    if slowest > args.budget_ms:
+        print("❌ Over budget")
+        sys.exit(1)
+    print("✅ Within budget")
+
+if __name__ == "__main__":
+    main()
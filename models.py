@@ -0,0 +1,135 @@
+"""
+Compact record types shared by the scraper and the dashboard.
+
+Every product used to be a plain dict with seven string keys, and every
+group member was wrapped again in an {"item": ..., "score": ...} dict.
+These classes use __slots__ so each record only stores its fields, which
+keeps memory flat when many pages or many days of reports are loaded.
+
+The report reader lives here too, so the dashboard and the search index
+read a report file back into exactly the same records.
+"""
+import re
+
+# ------------------------- ITEM RECORDS ---------------------------
+
+class Item:
+    """A single scraped product card."""
+    __slots__ = ("name", "price", "sku", "link", "sold_text", "sold_count", "image")
+
+    def __init__(self, name, price="", sku="", link="", sold_text=None, sold_count=0, image=""):
+        self.name = name
+        self.price = price
+        self.sku = sku
+        self.link = link
+        self.sold_text = sold_text
+        self.sold_count = sold_count
+        self.image = image
+
+    @property
+    def sold(self):
+        """Sold label for display: raw text if it was scraped, otherwise the count."""
+        return self.sold_text if self.sold_text is not None else str(self.sold_count)
+
+    def __repr__(self):
+        return f"Item({self.name!r}, sold_count={self.sold_count})"
+
+
+class SimilarItem:
+    """An item grouped under a top seller, with its fuzzy match score."""
+    __slots__ = ("item", "score")
+
+    def __init__(self, item, score):
+        self.item = item
+        self.score = score
+
+
+class Group:
+    """A top-selling item and the non-overlapping items similar to it."""
+    __slots__ = ("top", "similars")
+
+    def __init__(self, top, similars=None):
+        self.top = top
+        self.similars = similars if similars is not None else []
+
+
+# ------------------------- REPORT READER ---------------------------
+
+def parse_report_file(filepath):
+    """Reads a category report written by the scraper back into Group records."""
+    with open(filepath, "r", encoding="utf-8") as f: content = f.read()
+
+    data = {"search_term": "Unknown", "status": "Unknown", "url": "#", "groups": []}
+    
+    # Extract Metadata
+    search_match = re.search(r"SEARCH TERM : (.*)", content)
+    if search_match: data["search_term"] = search_match.group(1).strip()
+    
+    status_match = re.search(r"STATUS\s+: (.*)", content)
+    if status_match: data["status"] = status_match.group(1).strip()
+    
+    url_match = re.search(r"URL\s+: (.*)", content)
+    if url_match: data["url"] = url_match.group(1).strip()
+
+    # Parse Groups
+    group_chunks = content.split("🟦 GROUP #")[1:]
+    
+    for chunk in group_chunks:
+        lines = chunk.strip().split("\n")
+        
+        def get_val(key, line_list):
+            for l in line_list:
+                if key in l: return l.split(key)[1].strip()
+            return ""
+
+        try:
+            # Parse Top Item
+            t_name = get_val("Name:", lines)
+            t_price_sku = get_val("Price:", lines).split("|")
+            t_price = t_price_sku[0].strip()
+            # Extract SKU safely
+            t_sku = t_price_sku[1].replace("SKU:", "").strip() if len(t_price_sku) > 1 else ""
+            # Older reports printed a missing SKU as 'None'
+            if t_sku == "None": t_sku = ""
+            
+            t_link = get_val("Link:", lines)
+            t_image = get_val("Image:", lines)
+            
+            t_sold = 0
+            sold_match = re.search(r"Top Seller: (\d+) sold", lines[0])
+            if sold_match: t_sold = int(sold_match.group(1))
+
+            group_data = Group(Item(
+                name=t_name, price=t_price, sku=t_sku,
+                link=t_link, sold_count=t_sold, image=t_image
+            ))
+        except: continue
+
+        # Parse Similar Items
+        sim_start = -1
+        for i, l in enumerate(lines):
+            if "Similar Items" in l: sim_start = i; break
+        
+        if sim_start != -1:
+            current = None
+            for line in lines[sim_start+1:]:
+                line = line.strip()
+                if line.startswith("•"):
+                    if current: group_data.similars.append(current)
+                    current = None
+                    match = re.search(r"• \[([\d.]+)% Match\] (.*)", line)
+                    if match: current = SimilarItem(Item(name=match.group(2)), round(float(match.group(1))))
+                elif current is None: continue
+                elif "Price:" in line:
+                    parts = line.split("|")
+                    current.item.price = parts[0].replace("Price:", "").strip()
+                    current.item.sold_text = parts[1].replace("Sold:", "").strip() if len(parts)>1 else "N/A"
+                elif "Link:" in line: current.item.link = line.replace("Link:", "").strip()
+                elif line.startswith("SKU:"):
+                    sku = line.replace("SKU:", "").strip()
+                    current.item.sku = "" if sku == "None" else sku
+                # No Image for similars usually, but if scraper added them, parse here
+            if current: group_data.similars.append(current)
+
+        data["groups"].append(group_data)
+    return data
@@ -8,6 +8,9 @@ import sys
 from datetime import datetime
 from rapidfuzz import fuzz
 
+from models import Item, SimilarItem, Group
+import search_index
+
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
@@ -116,7 +119,7 @@ def scrape_page_items(driver):
         except: item_name = ""
         try: item_price = product.find_element(By.CSS_SELECTOR, ".aBrP0 .ooOxS").text.strip()
         except: item_price = ""
-        try: sku = product.get_attribute("data-sku-simple")
+        try: sku = product.get_attribute("data-sku-simple") or ""
         except: sku = ""
         try: 
             link = product.find_element(By.CSS_SELECTOR, "a").get_attribute("href")
@@ -148,11 +151,11 @@ def scrape_page_items(driver):
 
         # Only add valid items with names
         if item_name:
-            page_results.append({
-                "name": item_name, "price": item_price, "sku": sku,
-                "link": link, "sold_text": sold_text, "sold_count": sold_count,
-                "image": img_url
-            })
+            page_results.append(Item(
+                name=item_name, price=item_price, sku=sku,
+                link=link, sold_text=sold_text, sold_count=sold_count,
+                image=img_url
+            ))
             
     return page_results
 
@@ -263,7 +266,7 @@ def scrape_category(driver, query, save_dir):
     # 5. Sort and Analyze (New Grouping Logic)
     if all_results:
         # Sort ALL results by sold count first
-        sorted_results = sorted(all_results, key=lambda x: x["sold_count"], reverse=True)
+        sorted_results = sorted(all_results, key=lambda x: x.sold_count, reverse=True)
         
         # --- NEW ALGORITHM: GROUPING WITHOUT OVERLAP ---
         grouped_groups = []
@@ -283,10 +286,7 @@ def scrape_category(driver, query, save_dir):
             top_item = sorted_results[i]
             processed_indices.add(i)
             
-            current_group = {
-                "top": top_item,
-                "similars": []
-            }
+            current_group = Group(top_item)
             
             # Scan for similar items in the remainder of the list
             for j in range(i + 1, len(sorted_results)):
@@ -294,13 +294,10 @@ def scrape_category(driver, query, save_dir):
                     continue
                 
                 candidate = sorted_results[j]
-                score = fuzz.token_sort_ratio(top_item["name"], candidate["name"])
+                score = fuzz.token_sort_ratio(top_item.name, candidate.name)
                 
                 if score >= 90:
-                    current_group["similars"].append({
-                        "item": candidate,
-                        "score": score
-                    })
+                    current_group.similars.append(SimilarItem(candidate, round(score)))
                     processed_indices.add(j)
             
             grouped_groups.append(current_group)
@@ -309,20 +306,21 @@ def scrape_category(driver, query, save_dir):
         log(f"\nAnalyzed {len(all_results)} total items. Found {len(grouped_groups)} distinct top-selling groups.\n", output_lines)
 
         for idx, group in enumerate(grouped_groups, 1):
-            top = group["top"]
-            log(f"🟦 GROUP #{idx} (Top Seller: {top['sold_count']} sold)", output_lines)
-            log(f"   Name:  {top['name']}", output_lines)
-            log(f"   Price: {top['price']} | SKU: {top['sku']}", output_lines)
-            log(f"   Link:  {top['link']}", output_lines)
-            log(f"   Image: {top['image']}", output_lines)
+            top = group.top
+            log(f"🟦 GROUP #{idx} (Top Seller: {top.sold_count} sold)", output_lines)
+            log(f"   Name:  {top.name}", output_lines)
+            log(f"   Price: {top.price} | SKU: {top.sku}", output_lines)
+            log(f"   Link:  {top.link}", output_lines)
+            log(f"   Image: {top.image}", output_lines)
             
-            if group["similars"]:
-                log(f"   --- {len(group['similars'])} Similar Items (Non-Overlapping) ---", output_lines)
-                for sim in group["similars"]:
-                    item = sim["item"]
-                    log(f"   • [{sim['score']}% Match] {item['name']}", output_lines)
-                    log(f"     Price: {item['price']} | Sold: {item['sold_text']}", output_lines)
-                    log(f"     Link:  {item['link']}", output_lines)
+            if group.similars:
+                log(f"   --- {len(group.similars)} Similar Items (Non-Overlapping) ---", output_lines)
+                for sim in group.similars:
+                    item = sim.item
+                    log(f"   • [{sim.score}% Match] {item.name}", output_lines)
+                    log(f"     Price: {item.price} | Sold: {item.sold_text}", output_lines)
+                    log(f"     Link:  {item.link}", output_lines)
+                    log(f"     SKU:   {item.sku}", output_lines)
             else:
                 log("   --- No similar items found in top results ---", output_lines)
             
@@ -336,6 +334,16 @@ def scrape_category(driver, query, save_dir):
             f.write("\n".join(output_lines))
         
         print(f"✅ Report saved: {full_path}")
+
+        # Keep the dashboard search index in step with the new report
+        try:
+            conn = search_index.connect()
+            try:
+                search_index.index_report(conn, full_path, os.path.basename(save_dir))
+            finally:
+                conn.close()
+        except Exception as e:
+            print(f"⚠️ Could not update search index (report is still saved): {e}")
         return True
     
     return False
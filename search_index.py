@@ -0,0 +1,283 @@
+"""
+Full-text product search across every category report.
+
+The same product shows up in a report every day it is scraped, so the index
+keeps each distinct product once (keyed by SKU, or by link when the SKU is
+missing) and records every sighting in a separate occurrences table. Only
+the distinct products go into the FTS5 table, which keeps ranking fast no
+matter how many days of reports have been indexed.
+
+The scraper indexes each report right after writing it, and the dashboard
+catches up on any report files that are new or changed on disk, so the index
+never needs a full rebuild. Both paths index the parsed report file, so a
+report always produces the same rows however it was indexed.
+"""
+import os
+import re
+import sqlite3
+
+from models import parse_report_file
+
+# ------------------------- CONFIGURATION -------------------------------
+INDEX_DB = "search_index.db"
+
+# Bump when the schema changes; older index files are dropped and rebuilt
+SCHEMA_VERSION = 3
+
+# Broad queries only BM25-rank this many of the most recently added matches
+RANK_CANDIDATES = 5000
+
+# Daraz SKUs look like '264620815_BD-1235152779' (the suffix is optional)
+SKU_PATTERN = re.compile(r"\d+_[A-Za-z]+(-\d+)?")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    id          INTEGER PRIMARY KEY,
+    path        TEXT UNIQUE NOT NULL,
+    report_date TEXT NOT NULL,
+    category    TEXT NOT NULL,
+    mtime       REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS products (
+    id          INTEGER PRIMARY KEY,
+    product_key TEXT UNIQUE NOT NULL,
+    name        TEXT,
+    sku         TEXT,
+    link        TEXT,
+    image       TEXT,
+    price       TEXT,
+    last_seen   TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS products_sku ON products(sku);
+CREATE TABLE IF NOT EXISTS occurrences (
+    id         INTEGER PRIMARY KEY,
+    product_id INTEGER NOT NULL REFERENCES products(id),
+    report_id  INTEGER NOT NULL REFERENCES reports(id),
+    group_no   INTEGER NOT NULL,
+    score      INTEGER,
+    price      TEXT,
+    sold       TEXT
+);
+CREATE INDEX IF NOT EXISTS occurrences_product ON occurrences(product_id);
+CREATE INDEX IF NOT EXISTS occurrences_report ON occurrences(report_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5(name, sku, price, prefix='3');
+"""
+
+DROP_SCHEMA = """
+DROP TABLE IF EXISTS items_fts;
+DROP TABLE IF EXISTS items;
+DROP TABLE IF EXISTS products_fts;
+DROP TABLE IF EXISTS occurrences;
+DROP TABLE IF EXISTS products;
+DROP TABLE IF EXISTS reports;
+"""
+
+# ------------------------- HELPER FUNCTIONS ---------------------------
+
+def connect(db_path=INDEX_DB):
+    """Open the index, creating (or rebuilding an outdated) schema on first use."""
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+        # The index is derived from the report files, so it is safe to drop
+        conn.executescript(DROP_SCHEMA)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    conn.executescript(SCHEMA)
+    return conn
+
+def build_match_query(text):
+    """
+    Turn free text into an FTS5 query: every word must match. The last word
+    also matches as a prefix while typing, but only when it is a word of at
+    least 3 letters; short or numeric tails like 'bd' would match everything.
+    """
+    terms = re.findall(r"\w+", text)
+    if not terms:
+        return ""
+    quoted = [f'"{t}"' for t in terms]
+    if terms[-1].isalpha() and len(terms[-1]) >= 3:
+        quoted[-1] += "*"
+    return " ".join(quoted)
+
+def product_key(item):
+    """Identity of a product across reports: SKU, else link, else name."""
+    if item.sku:
+        return f"sku:{item.sku}"
+    if item.link:
+        return f"link:{item.link}"
+    return f"name:{item.name}"
+
+# ------------------------- INDEXING ---------------------------
+
+def upsert_product(conn, item, report_date):
+    """Return the product id for item, refreshing its details if this sighting is newer."""
+    key = product_key(item)
+    row = conn.execute(
+        "SELECT id, name, sku, price, last_seen FROM products WHERE product_key = ?",
+        (key,)).fetchone()
+
+    if row is None:
+        product_id = conn.execute(
+            "INSERT INTO products (product_key, name, sku, link, image, price, last_seen) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key, item.name, item.sku, item.link, item.image, item.price, report_date)).lastrowid
+        conn.execute(
+            "INSERT INTO products_fts (rowid, name, sku, price) VALUES (?, ?, ?, ?)",
+            (product_id, item.name, item.sku, item.price))
+        return product_id
+
+    product_id = row["id"]
+    if report_date >= row["last_seen"]:
+        conn.execute(
+            "UPDATE products SET name = ?, sku = ?, link = ?, image = ?, price = ?, last_seen = ? "
+            "WHERE id = ?",
+            (item.name, item.sku, item.link, item.image, item.price, report_date, product_id))
+        if (row["name"], row["sku"], row["price"]) != (item.name, item.sku, item.price):
+            conn.execute("DELETE FROM products_fts WHERE rowid = ?", (product_id,))
+            conn.execute(
+                "INSERT INTO products_fts (rowid, name, sku, price) VALUES (?, ?, ?, ?)",
+                (product_id, item.name, item.sku, item.price))
+    return product_id
+
+def clear_report(conn, report_id):
+    """Delete a report's occurrences and any products that are no longer seen anywhere."""
+    product_ids = [r[0] for r in conn.execute(
+        "SELECT DISTINCT product_id FROM occurrences WHERE report_id = ?", (report_id,))]
+    conn.execute("DELETE FROM occurrences WHERE report_id = ?", (report_id,))
+    for product_id in product_ids:
+        if conn.execute("SELECT 1 FROM occurrences WHERE product_id = ? LIMIT 1", (product_id,)).fetchone():
+            continue
+        conn.execute("DELETE FROM products_fts WHERE rowid = ?", (product_id,))
+        conn.execute("DELETE FROM products WHERE id = ?", (product_id,))
+
+def index_groups(conn, path, report_date, category, groups, mtime):
+    """
+    Replace the indexed occurrences of one report with the given groups.
+    Safe to call again for the same path after the report is rewritten.
+    """
+    with conn:
+        row = conn.execute("SELECT id FROM reports WHERE path = ?", (path,)).fetchone()
+        if row:
+            report_id = row["id"]
+            clear_report(conn, report_id)
+            conn.execute(
+                "UPDATE reports SET report_date = ?, category = ?, mtime = ? WHERE id = ?",
+                (report_date, category, mtime, report_id))
+        else:
+            report_id = conn.execute(
+                "INSERT INTO reports (path, report_date, category, mtime) VALUES (?, ?, ?, ?)",
+                (path, report_date, category, mtime)).lastrowid
+
+        for group_no, group in enumerate(groups, 1):
+            members = [(group.top, None)] + [(sim.item, sim.score) for sim in group.similars]
+            for item, score in members:
+                product_id = upsert_product(conn, item, report_date)
+                conn.execute(
+                    "INSERT INTO occurrences (product_id, report_id, group_no, score, price, sold) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (product_id, report_id, group_no, score, item.price, item.sold))
+
+def index_report(conn, path, report_date, mtime=None):
+    """Parse one report file and replace its indexed occurrences."""
+    if mtime is None:
+        mtime = os.path.getmtime(path)
+    data = parse_report_file(path)
+    index_groups(conn, path, report_date, data["search_term"], data["groups"], mtime)
+
+def remove_report(conn, path):
+    """Drop a report (and its occurrences) that no longer exists on disk."""
+    with conn:
+        row = conn.execute("SELECT id FROM reports WHERE path = ?", (path,)).fetchone()
+        if not row:
+            return
+        clear_report(conn, row["id"])
+        conn.execute("DELETE FROM reports WHERE id = ?", (row["id"],))
+
+def sync_reports(conn, base_dir):
+    """
+    Index report files under base_dir/<date>/ that are new or modified
+    since they were last indexed, and forget ones that were deleted.
+    Files that cannot be read are skipped and retried on the next sync.
+    Returns the number of reports (re)indexed.
+    """
+    known = {r["path"]: r["mtime"] for r in conn.execute("SELECT path, mtime FROM reports")}
+    seen = set()
+    updated = 0
+
+    if os.path.isdir(base_dir):
+        for report_date in os.listdir(base_dir):
+            date_dir = os.path.join(base_dir, report_date)
+            if not os.path.isdir(date_dir):
+                continue
+            for filename in os.listdir(date_dir):
+                if not filename.endswith(".txt"):
+                    continue
+                path = os.path.join(date_dir, filename)
+                try:
+                    mtime = os.path.getmtime(path)
+                    seen.add(path)
+                    if known.get(path) == mtime:
+                        continue
+                    index_report(conn, path, report_date, mtime)
+                except (OSError, UnicodeDecodeError) as e:
+                    print(f"⚠️ Skipping unreadable report {path}: {e}")
+                    continue
+                updated += 1
+
+    for path in known.keys() - seen:
+        remove_report(conn, path)
+    return updated
+
+# ------------------------- SEARCH ---------------------------
+
+def search(conn, text, limit=50):
+    """
+    Return the best matching products, each with its most recent sighting
+    (category, date, group, price, sold) and how many reports it appears in.
+    SKU-shaped queries are looked up exactly; everything else is BM25 ranked.
+    Ranking costs time per matching row, so when a very common word matches
+    more than RANK_CANDIDATES products only the newest of them are ranked.
+    """
+    text = text.strip()
+    product_ids = []
+    if SKU_PATTERN.fullmatch(text):
+        product_ids = [r[0] for r in conn.execute(
+            "SELECT id FROM products WHERE sku = ? LIMIT ?", (text, limit))]
+
+    if not product_ids:
+        match = build_match_query(text)
+        if not match:
+            return []
+        cutoff = conn.execute(
+            "SELECT rowid FROM products_fts WHERE products_fts MATCH ? ORDER BY rowid DESC LIMIT 1 OFFSET ?",
+            (match, RANK_CANDIDATES - 1)).fetchone()
+        product_ids = [r[0] for r in conn.execute(
+            "SELECT rowid FROM products_fts WHERE products_fts MATCH ? AND rowid >= ? ORDER BY rank LIMIT ?",
+            (match, cutoff[0] if cutoff else 0, limit))]
+
+    if not product_ids:
+        return []
+
+    # Attach each product's latest sighting in one query, then restore rank order
+    placeholders = ", ".join("?" * len(product_ids))
+    rows = conn.execute(
+        f"""
+        SELECT * FROM (
+            SELECT products.id, products.name, products.sku, products.link, products.image,
+                   occurrences.group_no, occurrences.score, occurrences.price, occurrences.sold,
+                   reports.category, reports.report_date, reports.path,
+                   COUNT(*) OVER (PARTITION BY products.id) AS times_seen,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY products.id
+                       ORDER BY reports.report_date DESC, occurrences.id DESC
+                   ) AS nth
+            FROM products
+            JOIN occurrences ON occurrences.product_id = products.id
+            JOIN reports ON reports.id = occurrences.report_id
+            WHERE products.id IN ({placeholders})
+        )
+        WHERE nth = 1
+        """,
+        product_ids).fetchall()
+    by_id = {row["id"]: row for row in rows}
+    return [by_id[product_id] for product_id in product_ids if product_id in by_id]